@@ -1,8 +1,18 @@
+import base64
+import io
+import json
+import math
+import os
+from functools import lru_cache
+
 import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
-from scipy import integrate
+from matplotlib.animation import FuncAnimation, writers
+from matplotlib.ticker import MaxNLocator
+from scipy import integrate, signal
+
+import fold_kernels
 
 st.set_page_config(page_title="Iterated Folding Visualizer", layout="wide")
 
@@ -14,7 +24,11 @@ st.title("Cyclic Folding")
 # =========================
 
 def fold(v0, v1, v2, v3):
-    v0_folded = (np.conj(v0 - v1) * (v3 - v1)) / np.conj(v3 - v1) + v1
+    # d / conj(d) == d**2 / |d|**2, which trades the complex division for a real one.
+    # The tiny offset keeps v3 == v1 finite (v0 lands on v1) without a branch.
+    d = v3 - v1
+    s = d.real * d.real + d.imag * d.imag
+    v0_folded = np.conj(v0 - v1) * d * d / (s + 1e-300) + v1
     new_v0 = v1
     new_v1 = v2
     new_v2 = v3
@@ -22,6 +36,79 @@ def fold(v0, v1, v2, v3):
     return new_v0, new_v1, new_v2, new_v3
 
 
+def _fresh_foldmod():
+    # foldmod is built from fold_kernels.py by `python build_foldmod.py` and is
+    # not tracked, so it must be rebuilt after editing the kernels. Until then
+    # it is ignored rather than silently running the old code.
+    try:
+        import foldmod
+    except ImportError:
+        return None
+    if os.path.getmtime(foldmod.__file__) < os.path.getmtime(fold_kernels.__file__):
+        return None
+    return foldmod
+
+
+# Prefer the ahead-of-time build; otherwise JIT compile at import so the first
+# click doesn't pay for it inside the spinner.
+_foldmod = _fresh_foldmod()
+if _foldmod is not None:
+    _iterate_fold = _foldmod.iterate_fold
+else:
+    _iterate_fold = fold_kernels.iterate_fold
+    _iterate_fold(0j, 0j, 0j, 0j, 0, False)
+
+
+def _iterate_fold_batch(v0, v1, v2, v3, iters):
+    # One orbit per column. This is fold spelled out with in-place ufuncs on
+    # preallocated scratch, so no temporaries are allocated per step.
+    out = np.empty((4 * (iters + 1), v0.size), dtype=np.complex128)
+    out[0:4] = (v0, v1, v2, v3)
+    d = np.empty(v0.size, dtype=np.complex128)
+    s = np.empty(v0.size)
+    t = np.empty(v0.size)
+    for k in range(iters):
+        a, b, _, e = out[4 * k:4 * k + 4]
+        folded = out[4 * k + 7]
+        out[4 * k + 4:4 * k + 7] = out[4 * k + 1:4 * k + 4]
+
+        np.subtract(e, b, out=d)
+        np.multiply(d.real, d.real, out=s)
+        np.multiply(d.imag, d.imag, out=t)
+        np.add(s, t, out=s)
+        np.add(s, 1e-300, out=s)
+        np.square(d, out=d)
+
+        np.subtract(a, b, out=folded)
+        np.conj(folded, out=folded)
+        np.multiply(folded, d, out=folded)
+        np.divide(folded, s, out=folded)
+        np.add(folded, b, out=folded)
+    return out
+
+
+@lru_cache(maxsize=128)
+def _init_vertices(mu, nu):
+    # 1 + mu*nu - mu - nu factored; math.sqrt skips numpy's scalar dispatch.
+    r = math.sqrt((1 - mu) * (1 - nu))
+    v0 = complex(-r, mu)
+    v1 = complex(r, nu)
+    return v0, v1, v1.conjugate(), v0.conjugate()
+
+
+@st.cache_data(max_entries=64)
+def _compute_orbit_points(mu, nu, iters, detect_period=False):
+    # Period detection only applies to single orbits; a batch runs to the end.
+    if np.ndim(mu) == 0 and np.ndim(nu) == 0:
+        return _iterate_fold(*_init_vertices(mu, nu), iters, detect_period)
+
+    mu, nu = np.broadcast_arrays(np.asarray(mu, dtype=float), np.asarray(nu, dtype=float))
+    r = np.sqrt((1 - mu) * (1 - nu))
+    v0 = -r + 1j * mu
+    v1 = r + 1j * nu
+    return _iterate_fold_batch(v0, v1, v1.conjugate(), v0.conjugate(), iters)
+
+
 def fold_centered(v0, v1, v2, v3):
     v0, v1, v2, v3 = fold(v0, v1, v2, v3)
     center = (v0 + v1 + v2 + v3) / 4
@@ -32,25 +119,48 @@ def fold_centered(v0, v1, v2, v3):
 # Orbit Plot
 # =========================
 
-def plot_orbit_to_image(mu, nu, iters, plotsize, pointsize=5):
-    v0 = -np.sqrt(1 + mu * nu - mu - nu) + 1j * mu
-    v1 = np.sqrt(1 + mu * nu - mu - nu) + 1j * nu
-    v2 = v1.conjugate()
-    v3 = v0.conjugate()
+def _axes_px(ax, dpi):
+    # Size of ax's plot area in pixels when its figure is rendered at dpi.
+    fig = ax.figure
+    pos = ax.get_position()
+    return pos.width * fig.get_figwidth() * dpi, pos.height * fig.get_figheight() * dpi
+
 
-    all_points = [v0, v1, v2, v3]
+def _orbit_coverage(points, plotsize, pointsize, area_px, dpi):
+    # Rasterize an orbit as a scatter would draw it over a (width, height) px
+    # plot area at the given dpi: bin it one cell per pixel, then spread each
+    # count over a marker-sized disk. Returns how many markers cover each
+    # pixel, rows running up in y.
+    bins = (int(area_px[0]), int(area_px[1]))
+    finite = points[np.isfinite(points)]
+    H, _, _ = np.histogram2d(finite.real, finite.imag, bins=bins, range=[[-plotsize, plotsize]] * 2)
 
-    for _ in range(iters):
-        v0, v1, v2, v3 = fold(v0, v1, v2, v3)
-        all_points.extend([v0, v1, v2, v3])
+    r = (np.sqrt(pointsize) + 1.5) / 72 * dpi / 2  # s is an area in pt^2, plus the edge
+    k = np.arange(-int(r), int(r) + 1)
+    disk = (k[:, None] ** 2 + k[None, :] ** 2 <= r * r).astype(float)
+    return np.rint(signal.fftconvolve(H, disk, mode="same")).T
 
-    x = [z.real for z in all_points]
-    y = [z.imag for z in all_points]
 
-    fig, ax = plt.subplots(figsize=(7, 7))
+def plot_orbit_to_image(mu, nu, iters, plotsize, pointsize=5, detect_period=True, ax=None):
+    all_points = _compute_orbit_points(mu, nu, iters, detect_period)
+
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(7, 7))
+    else:
+        fig = ax.figure
+        ax.cla()
     fig.subplots_adjust(top=0.92)
 
-    ax.scatter(x, y, color="black", s=pointsize, alpha=0.6)
+    if all_points.ndim == 2 and all_points.size > 500_000:
+        # Only large batched sweeps outgrow scatter: Agg's cost is per marker,
+        # while rasterizing at st.pyplot's 200 dpi is roughly constant. Below
+        # a few hundred thousand points the scatter is faster and exact.
+        cover = _orbit_coverage(all_points, plotsize, pointsize, _axes_px(ax, 200), dpi=200)
+        ax.imshow(1 - 0.4 ** cover, extent=[-plotsize, plotsize, -plotsize, plotsize], origin="lower",
+                  cmap="Greys", vmin=0, vmax=1, interpolation="nearest", aspect="auto")
+    else:
+        ax.scatter(all_points.real, all_points.imag, color="black", s=pointsize, alpha=0.6)
+
     ax.axhline(0, color="k", linewidth=0.5)
     ax.axvline(0, color="k", linewidth=0.5)
     ax.grid(True, alpha=0.3)
@@ -73,60 +183,108 @@ def animate_folding(
     iters_orbit=1000, alpha_orbit=0.3,
 ):
     if orbit:
-        v0_o = -np.sqrt(1 + mu * nu - mu - nu) + 1j * mu
-        v1_o = np.sqrt(1 + mu * nu - mu - nu) + 1j * nu
-        v2_o = v1_o.conjugate()
-        v3_o = v0_o.conjugate()
-
-        orbit_points = [v0_o, v1_o, v2_o, v3_o]
-
-        for _ in range(iters_orbit):
-            v0_o, v1_o, v2_o, v3_o = fold(v0_o, v1_o, v2_o, v3_o)
-            orbit_points.extend([v0_o, v1_o, v2_o, v3_o])
-
-        orbit_x = [z.real for z in orbit_points]
-        orbit_y = [z.imag for z in orbit_points]
-
-    v0 = -np.sqrt(1 + mu * nu - mu - nu) + 1j * mu
-    v1 = np.sqrt(1 + mu * nu - mu - nu) + 1j * nu
-    v2 = v1.conjugate()
-    v3 = v0.conjugate()
-
-    frames = [(v0, v1, v2, v3)]
-
-    for _ in range(iters):
-        v0, v1, v2, v3 = fold(v0, v1, v2, v3)
-        frames.append((v0, v1, v2, v3))
-
-    fig, ax = plt.subplots(figsize=(7, 7), dpi=80)
-    fig.subplots_adjust(top=0.92)
-
-    def update(frame_num):
-        ax.clear()
-
-        if orbit:
-            ax.scatter(orbit_x, orbit_y, color="gray", s=pointsize, alpha=alpha_orbit)
-
-        v0, v1, v2, v3 = frames[frame_num]
-        vertices = [v0, v1, v2, v3]
+        # Same cache key as plot_orbit_to_image, so switching modes reuses the orbit.
+        orbit_points = _compute_orbit_points(mu, nu, iters_orbit, True)
+
+    # The animated quadrilaterals are just the first `iters` steps of the orbit.
+    frames = _compute_orbit_points(mu, nu, iters).reshape(-1, 4)
+
+    # Emitted as an inline SVG whose polygon is moved by a small script, so
+    # frames never go through Agg and the payload stays a few KB.
+    size, pad = 560, 40
+    scale = (size - 2 * pad) / (2 * plotsize)
+
+    def to_px(z):
+        return np.column_stack((pad + (z.real + plotsize) * scale, pad + (plotsize - z.imag) * scale))
+
+    ticks = MaxNLocator(nbins=8, steps=[1, 2, 2.5, 5, 10]).tick_values(-plotsize, plotsize)
+    ticks = ticks[np.abs(ticks) <= plotsize]
+    tick_px = to_px(ticks + 1j * ticks)
+    zero_x, zero_y = to_px(np.array([0j]))[0]
+
+    grid = "".join(
+        f'<line x1="{x:.1f}" y1="{pad}" x2="{x:.1f}" y2="{size - pad}"/>'
+        f'<line x1="{pad}" y1="{y:.1f}" x2="{size - pad}" y2="{y:.1f}"/>'
+        for x, y in tick_px
+    )
+    labels = "".join(
+        f'<text x="{x:.1f}" y="{size - pad + 16}" text-anchor="middle">{t:g}</text>'
+        f'<text x="{pad - 6}" y="{y + 4:.1f}" text-anchor="end">{t:g}</text>'
+        for t, (x, y) in zip(ticks, tick_px)
+    )
+
+    backdrop = ""
+    if orbit:
+        # Rasterize the orbit once, one cell per plot pixel at 80 dpi, the same
+        # way animate_folding_centered draws its backdrop. SVG rows run down.
+        cover = _orbit_coverage(orbit_points, plotsize, pointsize, (size - 2 * pad,) * 2, dpi=80)[::-1]
+        rgba = np.empty(cover.shape + (4,))
+        rgba[..., :3] = 0.5
+        rgba[..., 3] = 1 - (1 - alpha_orbit) ** cover
+
+        png = io.BytesIO()
+        plt.imsave(png, rgba, format="png")
+        backdrop = (
+            f'<image x="{pad}" y="{pad}" width="{size - 2 * pad}" height="{size - 2 * pad}" '
+            f'preserveAspectRatio="none" '
+            f'href="data:image/png;base64,{base64.b64encode(png.getvalue()).decode()}"/>'
+        )
 
-        x = [z.real for z in vertices] + [v0.real]
-        y = [z.imag for z in vertices] + [v0.imag]
+    frames_px = np.round(to_px(frames.ravel()).reshape(-1, 4, 2), 1).tolist()
+
+    return f"""
+    <svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}"
+         font-family="sans-serif" font-size="11">
+      <defs><clipPath id="plot-area">
+        <rect x="{pad}" y="{pad}" width="{size - 2 * pad}" height="{size - 2 * pad}"/>
+      </clipPath></defs>
+      <rect width="{size}" height="{size}" fill="white"/>
+      <text id="title" x="{size / 2}" y="{pad - 12}" text-anchor="middle" font-size="14"></text>
+      <g stroke="#b0b0b0" stroke-opacity="0.3" stroke-width="0.8">{grid}</g>
+      <g>{labels}</g>
+      <g clip-path="url(#plot-area)">
+        {backdrop}
+        <line x1="{pad}" y1="{zero_y:.1f}" x2="{size - pad}" y2="{zero_y:.1f}" stroke="black" stroke-width="0.5"/>
+        <line x1="{zero_x:.1f}" y1="{pad}" x2="{zero_x:.1f}" y2="{size - pad}" stroke="black" stroke-width="0.5"/>
+        <polygon id="quad" fill="lightgray" fill-opacity="0.5" stroke="black" stroke-width="1"/>
+        <g id="verts" fill="black">
+          <circle r="2.5"/><circle r="2.5"/><circle r="2.5"/><circle r="2.5"/>
+        </g>
+      </g>
+      <rect x="{pad}" y="{pad}" width="{size - 2 * pad}" height="{size - 2 * pad}"
+            fill="none" stroke="black" stroke-width="0.8"/>
+    </svg>
+    <script>
+      const frames = {json.dumps(frames_px)};
+      const quad = document.getElementById("quad");
+      const verts = document.querySelectorAll("#verts circle");
+      const title = document.getElementById("title");
+      let i = 0;
+      function step() {{
+        const f = frames[i];
+        quad.setAttribute("points", f.map(p => p.join(",")).join(" "));
+        f.forEach((p, k) => {{
+          verts[k].setAttribute("cx", p[0]);
+          verts[k].setAttribute("cy", p[1]);
+        }});
+        title.textContent = "Iteration " + i;
+        i = (i + 1) % frames.length;
+      }}
+      step();
+      setInterval(step, {duration});
+    </script>
+    """
 
-        ax.fill(x, y, color="lightgray", alpha=0.5)
-        ax.plot(x, y, "k-", linewidth=1)
-        ax.scatter([z.real for z in vertices], [z.imag for z in vertices],
-                   color="black", s=20, zorder=5)
 
-        ax.axhline(0, color="k", linewidth=0.5)
-        ax.axvline(0, color="k", linewidth=0.5)
-        ax.grid(True, alpha=0.3)
-        ax.set_xlim(-plotsize, plotsize)
-        ax.set_ylim(-plotsize, plotsize)
-        ax.set_title(f"Iteration {frame_num}", pad=12)
+# =========================
+# Shared helper: animation export
+# =========================
 
-    anim = FuncAnimation(fig, update, frames=len(frames), interval=duration, repeat=True)
-    plt.close()
+def _animation_html(anim):
+    # A single H.264 stream is far smaller than jshtml's base64 PNG per frame;
+    # fall back to jshtml where ffmpeg isn't installed.
+    if writers.is_available("ffmpeg"):
+        return anim.to_html5_video()
     return anim.to_jshtml()
 
 
@@ -139,31 +297,7 @@ def animate_folding_centered(
     pointsize=2, orbit=False,
     iters_orbit=1000, alpha_orbit=0.3,
 ):
-    if orbit:
-        v0_o = -np.sqrt(1 + mu * nu - mu - nu) + 1j * mu
-        v1_o = np.sqrt(1 + mu * nu - mu - nu) + 1j * nu
-        v2_o = v1_o.conjugate()
-        v3_o = v0_o.conjugate()
-
-        center = (v0_o + v1_o + v2_o + v3_o) / 4
-        v0_o -= center
-        v1_o -= center
-        v2_o -= center
-        v3_o -= center
-
-        orbit_points = [v0_o, v1_o, v2_o, v3_o]
-
-        for _ in range(iters_orbit):
-            v0_o, v1_o, v2_o, v3_o = fold_centered(v0_o, v1_o, v2_o, v3_o)
-            orbit_points.extend([v0_o, v1_o, v2_o, v3_o])
-
-        orbit_x = [z.real for z in orbit_points]
-        orbit_y = [z.imag for z in orbit_points]
-
-    v0 = -np.sqrt(1 + mu * nu - mu - nu) + 1j * mu
-    v1 = np.sqrt(1 + mu * nu - mu - nu) + 1j * nu
-    v2 = v1.conjugate()
-    v3 = v0.conjugate()
+    v0, v1, v2, v3 = _init_vertices(mu, nu)
 
     center = (v0 + v1 + v2 + v3) / 4
     v0 -= center
@@ -171,42 +305,57 @@ def animate_folding_centered(
     v2 -= center
     v3 -= center
 
-    frames = [(v0, v1, v2, v3)]
+    if orbit:
+        orbit_points = np.empty(4 * (iters_orbit + 1), dtype=np.complex128)
+        orbit_points[0:4] = (v0, v1, v2, v3)
 
-    for _ in range(iters):
-        v0, v1, v2, v3 = fold_centered(v0, v1, v2, v3)
-        frames.append((v0, v1, v2, v3))
+        for k in range(iters_orbit):
+            orbit_points[4 * k + 4:4 * k + 8] = fold_centered(*orbit_points[4 * k:4 * k + 4])
 
-    fig, ax = plt.subplots(figsize=(7, 7), dpi=80)
-    fig.subplots_adjust(top=0.92)
+    frames = np.empty((iters + 1, 4), dtype=np.complex128)
+    frames[0] = (v0, v1, v2, v3)
 
-    def update(frame_num):
-        ax.clear()
+    for k in range(iters):
+        frames[k + 1] = fold_centered(*frames[k])
 
-        if orbit:
-            ax.scatter(orbit_x, orbit_y, color="gray", s=pointsize, alpha=alpha_orbit)
+    fig, ax = plt.subplots(figsize=(7, 7), dpi=80)
+    fig.subplots_adjust(top=0.92)
 
-        v0, v1, v2, v3 = frames[frame_num]
-        vertices = [v0, v1, v2, v3]
+    # Static artists are drawn once; update() only moves the quadrilateral. The
+    # orbit backdrop is rasterized a single time rather than re-scattered per frame.
+    if orbit:
+        cover = _orbit_coverage(orbit_points, plotsize, pointsize, _axes_px(ax, fig.dpi), dpi=fig.dpi)
+        backdrop = np.empty(cover.shape + (4,))
+        backdrop[..., :3] = 0.5
+        backdrop[..., 3] = 1 - (1 - alpha_orbit) ** cover
+        ax.imshow(backdrop, extent=[-plotsize, plotsize, -plotsize, plotsize], origin="lower",
+                  interpolation="nearest", aspect="auto", zorder=0)
+
+    poly = ax.fill([], [], color="lightgray", alpha=0.5)[0]
+    line, = ax.plot([], [], "k-", linewidth=1)
+    pts = ax.scatter([], [], color="black", s=20, zorder=5)
+    title = ax.set_title("", pad=12)
 
-        x = [z.real for z in vertices] + [v0.real]
-        y = [z.imag for z in vertices] + [v0.imag]
+    ax.axhline(0, color="k", linewidth=0.5)
+    ax.axvline(0, color="k", linewidth=0.5)
+    ax.grid(True, alpha=0.3)
+    ax.set_xlim(-plotsize, plotsize)
+    ax.set_ylim(-plotsize, plotsize)
 
-        ax.fill(x, y, color="lightgray", alpha=0.5)
-        ax.plot(x, y, "k-", linewidth=1)
-        ax.scatter([z.real for z in vertices], [z.imag for z in vertices],
-                   color="black", s=20, zorder=5)
+    def update(frame_num):
+        quad = frames[frame_num]
+        xy = np.column_stack((quad.real, quad.imag))
+        closed = np.vstack((xy, xy[:1]))
 
-        ax.axhline(0, color="k", linewidth=0.5)
-        ax.axvline(0, color="k", linewidth=0.5)
-        ax.grid(True, alpha=0.3)
-        ax.set_xlim(-plotsize, plotsize)
-        ax.set_ylim(-plotsize, plotsize)
-        ax.set_title(f"Iteration {frame_num} (Centered)", pad=12)
+        poly.set_xy(closed)
+        line.set_data(closed[:, 0], closed[:, 1])
+        pts.set_offsets(xy)
+        title.set_text(f"Iteration {frame_num} (Centered)")
+        return poly, line, pts, title
 
-    anim = FuncAnimation(fig, update, frames=len(frames), interval=duration, repeat=True)
+    anim = FuncAnimation(fig, update, frames=len(frames), interval=duration, repeat=True, blit=True)
     plt.close()
-    return anim.to_jshtml()
+    return _animation_html(anim)
 
 
 # =========================
@@ -214,10 +363,7 @@ def animate_folding_centered(
 # =========================
 
 def _dd_initial_vertices(mu, nu):
-    v0 = -np.sqrt(1 + mu * nu - mu - nu) + 1j * mu
-    v1 =  np.sqrt(1 + mu * nu - mu - nu) + 1j * nu
-    v2 = v1.conjugate()
-    v3 = v0.conjugate()
+    v0, v1, v2, v3 = _init_vertices(mu, nu)
     center = (v0 + v1 + v2 + v3) / 4
     return v0 - center, v1 - center, v2 - center, v3 - center
 
@@ -283,24 +429,16 @@ def diagonal_dynamics_animation(mu, nu, iters, duration_ms, quad_window=1.5, res
         rho = _dd_compute_rho(mu, nu)
         theta_step = 2 * np.pi * rho
 
-    v0, v1, v2, v3 = _dd_initial_vertices(mu, nu)
-    frames = [(v0, v1, v2, v3)]
-    orbit_x, orbit_y = [], []
+    frames = np.empty((iters + 1, 4), dtype=np.complex128)
+    frames[0] = _dd_initial_vertices(mu, nu)
 
-    for i in range(iters + 1):
-        if i > 0:
-            v0, v1, v2, v3 = fold_centered(v0, v1, v2, v3)
-            frames.append((v0, v1, v2, v3))
+    for k in range(iters):
+        frames[k + 1] = fold_centered(*frames[k])
 
-        x_diag, y_diag = _dd_diagonal_pair(v0, v1, v2, v3)
-        if i % 2 == 1:
-            x_diag, y_diag = y_diag, x_diag
-
-        orbit_x.append(x_diag)
-        orbit_y.append(y_diag)
-
-    orbit_x = np.array(orbit_x)
-    orbit_y = np.array(orbit_y)
+    orbit_x, orbit_y = _dd_diagonal_pair(*frames.T)
+    # Each fold relabels the vertices, so the diagonals trade places on odd steps.
+    odd = np.arange(iters + 1) % 2 == 1
+    orbit_x[odd], orbit_y[odd] = orbit_y[odd], orbit_x[odd]
 
     curve_pad = 1.0
     Q, L, C = _dd_QLC(mu, nu)
@@ -331,13 +469,11 @@ def diagonal_dynamics_animation(mu, nu, iters, duration_ms, quad_window=1.5, res
     Z = F(X, Y)
 
     if not degenerate:
-        circle_pts_list = []
-        theta = 0
-        for i in range(iters + 1):
-            circle_pts_list.append((np.cos(theta), np.sin(theta)))
-            if i % 2 == 1:
-                theta += theta_step
-        circle_pts = np.array(circle_pts_list)  # shape: (iters+1, 2)
+        # The angle advances by theta_step after every odd iteration.
+        theta = theta_step * (np.arange(iters + 1) // 2)
+        circle_pts = np.empty((iters + 1, 2))  # shape: (iters+1, 2)
+        circle_pts[:, 0] = np.cos(theta)
+        circle_pts[:, 1] = np.sin(theta)
 
     n_panels = 2 if degenerate else 3
 
@@ -361,17 +497,14 @@ def diagonal_dynamics_animation(mu, nu, iters, duration_ms, quad_window=1.5, res
 
     def update(i):
         ax_quad.clear()
-        v0, v1, v2, v3 = frames[i]
-        verts = [v0, v1, v2, v3]
-        xq = [z.real for z in verts] + [v0.real]
-        yq = [z.imag for z in verts] + [v0.imag]
-
-        ax_quad.fill(xq, yq, color="lightgray", alpha=0.5)
-        ax_quad.plot(xq, yq, "k-", linewidth=1)
-        ax_quad.plot([v0.real, v2.real], [v0.imag, v2.imag], "k:", linewidth=1)
-        ax_quad.plot([v1.real, v3.real], [v1.imag, v3.imag], "k:", linewidth=1)
-        ax_quad.scatter([z.real for z in verts], [z.imag for z in verts],
-                        color="black", s=30, zorder=5)
+        quad = frames[i]
+        closed = np.append(quad, quad[0])
+
+        ax_quad.fill(closed.real, closed.imag, color="lightgray", alpha=0.5)
+        ax_quad.plot(closed.real, closed.imag, "k-", linewidth=1)
+        ax_quad.plot(quad[0::2].real, quad[0::2].imag, "k:", linewidth=1)
+        ax_quad.plot(quad[1::2].real, quad[1::2].imag, "k:", linewidth=1)
+        ax_quad.scatter(quad.real, quad.imag, color="black", s=30, zorder=5)
         ax_quad.set_xlim(-quad_window, quad_window)
         ax_quad.set_ylim(-quad_window, quad_window)
         ax_quad.set_aspect("equal")
@@ -408,7 +541,7 @@ def diagonal_dynamics_animation(mu, nu, iters, duration_ms, quad_window=1.5, res
     plt.close()
 
     render_height = int(fig_h * dpi) + 280
-    return anim.to_jshtml(), degenerate, render_height
+    return _animation_html(anim), degenerate, render_height
 
 
 # =========================
@@ -490,11 +623,15 @@ if mode == "Plot Orbit":
         pointsize = st.slider("Point Size", 1, 10, 5, 1, key="orbit_pointsize")
 
     if st.button("Generate Orbit Plot", type="primary", use_container_width=True) and mu is not None and nu is not None:
-        fig = plot_orbit_to_image(mu, nu, iters, plotsize, pointsize)
+        # One figure per session, redrawn in place, instead of a new canvas per click.
+        if "orbit_fig" not in st.session_state:
+            st.session_state.orbit_fig, st.session_state.orbit_ax = plt.subplots(figsize=(7, 7))
+            plt.close(st.session_state.orbit_fig)
+
+        fig = plot_orbit_to_image(mu, nu, iters, plotsize, pointsize, ax=st.session_state.orbit_ax)
         buf_col1, buf_col2, buf_col3 = st.columns([1, 2.5, 1])
         with buf_col2:
             st.pyplot(fig, use_container_width=True)
-        plt.close()
 
 
 # =========================
@@ -0,0 +1,15 @@
+# Ahead-of-time build of the orbit recurrence: `python build_foldmod.py` writes
+# a foldmod extension next to app.py, which then imports it instead of paying
+# Numba's JIT compile on startup. pycc builds without fastmath; rebuild after
+# editing fold_kernels.py (app.py ignores an older build).
+
+from numba.pycc import CC
+
+from fold_kernels import iterate_fold
+
+cc = CC("foldmod")
+cc.export("iterate_fold", "c16[:](c16, c16, c16, c16, i8, b1)")(iterate_fold.py_func)
+
+
+if __name__ == "__main__":
+    cc.compile()